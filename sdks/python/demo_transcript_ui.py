@@ -4,20 +4,27 @@ Demo script to test transcript UI with simulated transcripts
 This bypasses the Opus decoding issue and shows how the UI works
 """
 
+import argparse
 import asyncio
 import os
 import sys
-from transcript_ui import TranscriptWindow
-from memory import init_memory_storage, process_transcript_for_memory, cleanup_memory_storage
 from env_config import setup_environment
 
-async def demo_transcripts():
-    """Demo the transcript UI with simulated transcripts"""
+async def demo_transcripts(burst=False):
+    """Demo the transcript UI with simulated transcripts
+    
+    With burst=True phrases arrive 50 ms apart instead of 3 s, to exercise
+    how the UI copes with a flood of updates.
+    """
     
     # Setup environment
     print("🔧 Setting up environment...")
     setup_environment()
     
+    # Deferred so argument parsing and startup messages don't pay for Tk/httpx
+    from transcript_ui import TranscriptWindow
+    from memory import init_memory_storage, process_transcript_for_memory, cleanup_memory_storage
+    
     # Initialize memory storage
     print("🧠 Initializing memory storage...")
     omi_key = os.getenv("OMI_API_KEY", "demo_key")
@@ -49,12 +56,15 @@ async def demo_transcripts():
     
     print("🎭 Starting demo sequence...")
     
-    for i, phrase in enumerate(demo_phrases):
+    interval = 0.05 if burst else 3
+    
+    async def emit(index, phrase):
+        # Stagger the phrases; each one's memory processing overlaps the rest
+        await asyncio.sleep(index * interval)
         if not ui.is_running():
-            print("🚪 UI closed, stopping demo")
-            break
-            
-        print(f"📝 Demo phrase {i+1}: {phrase}")
+            return
+        
+        print(f"📝 Demo phrase {index+1}: {phrase}")
         
         # Update transcript in UI
         ui.update_transcript(phrase)
@@ -66,24 +76,36 @@ async def demo_transcripts():
                 print(f"📌 Memory created: {category}")
                 ui.update_memory(category, phrase)
             else:
-                print("ℹ️  No hot phrase detected")
+                print(f"ℹ️  No hot phrase detected: {phrase}")
         except Exception as e:
             print(f"Memory processing error: {e}")
-        
-        # Wait between phrases
-        await asyncio.sleep(3)
     
-    print("✅ Demo completed!")
-    ui.update_status("✅ Demo completed - UI fully functional!")
+    tasks = [asyncio.create_task(emit(i, phrase)) for i, phrase in enumerate(demo_phrases)]
+    emitting = asyncio.gather(*tasks, return_exceptions=True)
+    window_closed = asyncio.ensure_future(ui.wait_closed())
+    
+    # Stop as soon as the window closes rather than after the last phrase
+    await asyncio.wait({emitting, window_closed}, return_when=asyncio.FIRST_COMPLETED)
+    if window_closed.done():
+        print("🚪 UI closed, stopping demo")
+        for task in tasks:
+            task.cancel()
     
-    # Keep UI open until user closes it
-    while ui.is_running():
-        await asyncio.sleep(1)
+    for phrase, result in zip(demo_phrases, await emitting):
+        if isinstance(result, Exception):
+            print(f"❌ Demo phrase failed ({phrase}): {result!r}")
+    
+    if not window_closed.done():
+        print("✅ Demo completed!")
+        ui.update_status("✅ Demo completed - UI fully functional!")
+        
+        # Keep UI open until user closes it
+        await window_closed
     
     print("🧹 Cleaning up...")
     await cleanup_memory_storage()
 
-async def main():
+async def main(burst=False):
     """Run the demo"""
     print("🚀 Omi Transcript UI Demo")
     print("=" * 40)
@@ -98,7 +120,7 @@ async def main():
     print("=" * 40)
     
     try:
-        await demo_transcripts()
+        await demo_transcripts(burst=burst)
     except KeyboardInterrupt:
         print("🛑 Demo stopped by user")
     except Exception as e:
@@ -107,4 +129,8 @@ async def main():
     print("Demo finished!")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Omi transcript UI demo")
+    parser.add_argument("--burst", action="store_true",
+                        help="emit demo phrases 50 ms apart to stress the UI")
+    args = parser.parse_args()
+    asyncio.run(main(burst=args.burst))
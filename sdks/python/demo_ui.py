@@ -4,13 +4,38 @@ Demonstrates the real-time transcript window with sample data
 """
 
 import asyncio
+import re
 import time
-from transcript_ui import TranscriptWindow
+
+# Simulated memory keywords, highest priority first
+MEMORY_KEYWORDS = [
+    ("note this", "note"),
+    ("idea", "idea"),
+    ("important", "important"),
+    ("todo", "todo"),
+    ("contact", "contact"),
+]
+_KEYWORD_PRIORITY = {keyword: i for i, (keyword, _) in enumerate(MEMORY_KEYWORDS)}
+# One case-insensitive scan finds every keyword instead of one scan per keyword
+_KEYWORD_RE = re.compile("|".join(re.escape(k) for k, _ in MEMORY_KEYWORDS), re.IGNORECASE)
+
+
+def match_memory_category(transcript):
+    """Return the category of the highest-priority keyword in transcript, if any"""
+    best = None
+    for match in _KEYWORD_RE.finditer(transcript):
+        priority = _KEYWORD_PRIORITY[match.group(0).lower()]
+        if best is None or priority < best:
+            best = priority
+    return MEMORY_KEYWORDS[best][1] if best is not None else None
 
 async def demo_transcript_ui():
     """Demo the transcript UI with sample data"""
     print("🚀 Starting Transcript UI Demo...")
     
+    # Deferred so the banner prints before Tk is imported
+    from transcript_ui import TranscriptWindow
+    
     # Create the UI window
     ui = TranscriptWindow("🧪 Transcript UI Demo")
     
@@ -46,30 +71,20 @@ async def demo_transcript_ui():
         await asyncio.sleep(2)  # Simulate real-time delay
         
         print(f"📝 Adding transcript: {transcript}")
-        ui.update_transcript(transcript)
+        pending = [('transcript', transcript)]
         
         # Simulate memory creation for certain phrases
-        if "note this" in transcript.lower():
-            await asyncio.sleep(0.5)
-            ui.update_memory("note", transcript)
-        elif "idea" in transcript.lower():
-            await asyncio.sleep(0.5)
-            ui.update_memory("idea", transcript)
-        elif "important" in transcript.lower():
-            await asyncio.sleep(0.5)
-            ui.update_memory("important", transcript)
-        elif "todo" in transcript.lower():
-            await asyncio.sleep(0.5)
-            ui.update_memory("todo", transcript)
-        elif "contact" in transcript.lower():
-            await asyncio.sleep(0.5)
-            ui.update_memory("contact", transcript)
+        category = match_memory_category(transcript)
+        if category:
+            pending.append(('memory', category, transcript))
+        
+        # Apply the transcript and any memory notification in one UI pass
+        ui.apply_updates(pending)
     
     print("✅ Demo completed! Close the window to exit.")
     
     # Keep running until window is closed
-    while ui.is_running():
-        await asyncio.sleep(1)
+    await ui.wait_closed()
     
     print("👋 UI window closed. Demo finished.")
 
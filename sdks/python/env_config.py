@@ -2,8 +2,23 @@
 Environment configuration loader for Omi Python SDK
 """
 
+import logging
 import os
+import re
 from pathlib import Path
+from typing import Optional, Tuple
+
+
+# KEY=VALUE lines; values may be double/single quoted and followed by a # comment
+_ENV_LINE_RE = re.compile(
+    r"""^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*"""
+    r"""(?:"([^"\r\n]*)"|'([^'\r\n]*)'|([^\r\n]*?))"""
+    r"""[ \t]*(?:[ \t]#[^\r\n]*)?\r?$""",
+    re.MULTILINE,
+)
+
+REQUIRED_ENV_VARS = frozenset({"DEEPGRAM_API_KEY"})
+OPTIONAL_ENV_VARS = frozenset({"OMI_API_KEY", "OMI_USER_ID", "MCP_BASE_URL", "MEMORY_FILE"})
 
 
 def load_env_file(env_path: str = ".env") -> bool:
@@ -23,29 +38,14 @@ def load_env_file(env_path: str = ".env") -> bool:
         return False
     
     try:
-        with open(env_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                
-                # Skip empty lines and comments
-                if not line or line.startswith('#'):
-                    continue
-                
-                # Parse KEY=VALUE format
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    key = key.strip()
-                    value = value.strip()
-                    
-                    # Remove quotes if present
-                    if value.startswith('"') and value.endswith('"'):
-                        value = value[1:-1]
-                    elif value.startswith("'") and value.endswith("'"):
-                        value = value[1:-1]
-                    
-                    # Only set if not already in environment
-                    if key and not os.getenv(key):
-                        os.environ[key] = value
+        text = env_file.read_text(encoding='utf-8')
+        
+        for match in _ENV_LINE_RE.finditer(text):
+            key, double_quoted, single_quoted, bare = match.groups()
+            value = double_quoted or single_quoted or bare or ''
+            
+            # Only set if not already in environment
+            os.environ.setdefault(key, value)
         
         print(f"✅ Loaded environment from {env_path}")
         return True
@@ -55,6 +55,22 @@ def load_env_file(env_path: str = ".env") -> bool:
         return False
 
 
+def read_env_bytes(env_path: str = ".env") -> Optional[bytes]:
+    """
+    Read a .env file as raw bytes for quick placeholder checks
+    
+    Args:
+        env_path: Path to the .env file
+        
+    Returns:
+        Optional[bytes]: File contents, or None if the file does not exist
+    """
+    try:
+        return Path(env_path).read_bytes()
+    except FileNotFoundError:
+        return None
+
+
 def check_required_env_vars() -> bool:
     """
     Check if all required environment variables are set
@@ -62,35 +78,45 @@ def check_required_env_vars() -> bool:
     Returns:
         bool: True if all required vars are present
     """
-    required_vars = ["DEEPGRAM_API_KEY"]
-    optional_vars = ["OMI_API_KEY", "OMI_USER_ID", "MCP_BASE_URL", "MEMORY_FILE"]
-    
-    missing_required = []
-    missing_optional = []
-    
-    for var in required_vars:
-        if not os.getenv(var):
-            missing_required.append(var)
-    
-    for var in optional_vars:
-        if not os.getenv(var):
-            missing_optional.append(var)
+    # Empty values count as unset
+    missing_required = {name for name in REQUIRED_ENV_VARS if not os.environ.get(name)}
+    missing_optional = {name for name in OPTIONAL_ENV_VARS if not os.environ.get(name)}
     
     if missing_required:
         print("❌ Missing required environment variables:")
-        for var in missing_required:
+        for var in sorted(missing_required):
             print(f"   - {var}")
         return False
     
     if missing_optional:
         print("⚠️  Optional environment variables not set:")
-        for var in missing_optional:
+        for var in sorted(missing_optional):
             print(f"   - {var} (will use defaults)")
     
     print("✅ Environment configuration OK")
     return True
 
 
+def configure_sdk_logging() -> None:
+    """
+    Route the omi package's log records to stderr at the OMI_LOG level
+    
+    SDK diagnostics (e.g. audio send progress) go through the "omi" logger;
+    OMI_LOG=DEBUG turns them on. The root logger is left alone so code
+    importing this module keeps its own logging setup.
+    """
+    level = logging.getLevelName(os.getenv("OMI_LOG", "WARNING").upper())
+    logger = logging.getLogger("omi")
+    logger.setLevel(level if isinstance(level, int) else logging.WARNING)
+    
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        # Our handler already prints these; don't repeat them via the root
+        logger.propagate = False
+
+
 def setup_environment() -> bool:
     """
     Complete environment setup - load .env and validate
@@ -101,5 +127,37 @@ def setup_environment() -> bool:
     # Try to load .env file
     load_env_file()
     
+    configure_sdk_logging()
+    
     # Check configuration
     return check_required_env_vars()
+
+
+def load_runtime_config() -> Optional[Tuple[str, str]]:
+    """
+    Set up the environment and read the settings the live pipeline needs
+    
+    Returns:
+        Optional[Tuple[str, str]]: (OMI_MAC, DEEPGRAM_API_KEY), or None if
+        anything is missing
+    """
+    print("🔧 Setting up environment...")
+    if not setup_environment():
+        print("❌ Environment setup failed. Check your configuration.")
+        return None
+    
+    # Get OMI_MAC after environment is loaded
+    omi_mac = os.getenv("OMI_MAC")
+    if not omi_mac:
+        print("❌ OMI_MAC is required but not set in .env file.")
+        print("💡 Please add OMI_MAC=your_device_mac_address to your .env file")
+        return None
+    
+    api_key = os.getenv("DEEPGRAM_API_KEY")
+    if not api_key:
+        print("❌ DEEPGRAM_API_KEY is required but not set.")
+        print("💡 Create a .env file based on .env.example")
+        return None
+    
+    print(f"🎧 Using Omi device: {omi_mac}")
+    return omi_mac, api_key
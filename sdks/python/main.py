@@ -1,47 +1,37 @@
 import asyncio
 import os
-import ctypes
 import sys
-from omi.bluetooth import listen_to_omi
-from omi.transcribe import transcribe
-from omi.decoder import OmiOpusDecoder
-from asyncio import Queue
-from memory import init_memory_storage, process_transcript_for_memory, cleanup_memory_storage
-from env_config import setup_environment
-from transcript_ui import TranscriptWindow
+from concurrent.futures import ThreadPoolExecutor
+from env_config import load_runtime_config
 
 OMI_CHAR_UUID = "19B10001-E8F2-537E-4F6C-D104768A1214"
 
-# Force-load libopus from local directory if available
-dll_path = os.path.join(os.path.dirname(__file__), "libopus-0.dll")
-if os.path.exists(dll_path):
-    ctypes.cdll.LoadLibrary(dll_path)
-    print("✅ Loaded libopus-0.dll for optimal audio decoding")
-else:
-    print(f"⚠️  libopus-0.dll not found at: {dll_path}")
-    print("🔄 Will use fallback decoder (limited functionality)")
+# Background memory tasks allowed in flight before on_transcript waits for
+# one to finish, so a stalled MCP server cannot pile up tasks without bound
+MAX_PENDING_MEMORY_TASKS = 32
 
 def main():
-    # Setup environment variables
-    print("🔧 Setting up environment...")
-    if not setup_environment():
-        print("❌ Environment setup failed. Check your configuration.")
-        return
-    
-    # Get OMI_MAC after environment is loaded
-    OMI_MAC = os.getenv("OMI_MAC")
-    if not OMI_MAC:
-        print("❌ OMI_MAC is required but not set in .env file.")
-        print("💡 Please add OMI_MAC=your_device_mac_address to your .env file")
-        return
-    
-    api_key = os.getenv("DEEPGRAM_API_KEY")
-    if not api_key:
-        print("❌ DEEPGRAM_API_KEY is required but not set.")
-        print("💡 Create a .env file based on .env.example")
+    # Setup environment variables and validate the device/Deepgram settings
+    runtime_config = load_runtime_config()
+    if runtime_config is None:
         return
+    OMI_MAC, api_key = runtime_config
 
-    print(f"🎧 Using Omi device: {OMI_MAC}")
+    # Heavy imports (Bluetooth, Tk, libopus/opuslib, httpx) are deferred until
+    # the configuration checks above have passed
+    from omi.bluetooth import listen_to_omi
+    from omi.transcribe import transcribe
+    # Map libopus once for the whole process before the decoder (and opuslib) need it
+    from omi import _opus_loader as opus_loader
+    from omi.decoder import OmiOpusDecoder
+    from omi.audio_queue import AudioFrameQueue
+    from omi.ble_audio import make_ble_handler
+    from omi import event_loop
+    from memory import init_memory_storage, process_transcript_for_memory, cleanup_memory_storage
+    from transcript_ui import TranscriptWindow
+
+    if opus_loader.HANDLE is None:
+        print("🔄 Opus library not found - will use fallback decoder (limited functionality)")
 
     # Initialize the transcript UI window
     print("🖥️ Starting transcript UI window...")
@@ -59,25 +49,23 @@ def main():
         ui.update_status("⚠️ Using local memory storage...")
         init_memory_storage("dummy_key", user_id="default_user")  # Will fallback to local storage
 
-    audio_queue = Queue()
     decoder = OmiOpusDecoder()
 
-    def handle_ble_data(sender, data):
-        decoded_pcm = decoder.decode_packet(data)
-        if decoded_pcm:
-            try:
-                audio_queue.put_nowait(decoded_pcm)
-                # Track audio activity (minimal logging)
-                if hasattr(handle_ble_data, 'counter'):
-                    handle_ble_data.counter += 1
-                else:
-                    handle_ble_data.counter = 1
-                
-                # Only log every 500th packet (much less verbose)
-                if handle_ble_data.counter % 500 == 0:
-                    print(f"🎤 Audio: {handle_ble_data.counter} packets processed")
-            except Exception as e:
-                print("Queue Error:", e)
+    # In-flight memory tasks; the semaphore (created in run()) caps
+    # concurrent MCP requests
+    pending_memory_tasks = set()
+    memory_semaphore = None
+
+    async def process_memory(transcript):
+        try:
+            async with memory_semaphore:
+                memory_created, category = await process_transcript_for_memory(transcript)
+            
+            if memory_created and category:
+                print("📌 Memory created successfully!")
+                ui.update_memory(category, transcript)
+        except Exception as e:
+            print(f"Memory processing error: {e}")
 
     async def on_transcript(transcript):
         print("🎯 Caught transcript in handler:", transcript)
@@ -85,12 +73,16 @@ def main():
         # Update the UI window with new transcript
         ui.update_transcript(transcript)
 
-        # Process transcript for hot phrases and create memory
-        memory_created, category = await process_transcript_for_memory(transcript)
-        
-        if memory_created and category:
-            print("📌 Memory created successfully!")
-            ui.update_memory(category, transcript)
+        # Past the high-watermark, wait for a memory task to finish first
+        if len(pending_memory_tasks) >= MAX_PENDING_MEMORY_TASKS:
+            print(f"⏳ {len(pending_memory_tasks)} memory tasks pending, waiting for one to finish...")
+            await asyncio.wait(pending_memory_tasks, return_when=asyncio.FIRST_COMPLETED)
+
+        # Process transcript for hot phrases and create memory in the
+        # background so the transcript stream is not held up by MCP calls
+        task = asyncio.create_task(process_memory(transcript))
+        pending_memory_tasks.add(task)
+        task.add_done_callback(pending_memory_tasks.discard)
     
     # Add demo transcripts to show the system working while the decoder is being fixed
     async def demo_transcript_injection():
@@ -122,6 +114,16 @@ def main():
             await asyncio.sleep(10)  # Wait 10 seconds between demo transcripts (reduced from 20)
 
     async def run():
+        nonlocal memory_semaphore
+        memory_semaphore = asyncio.Semaphore(8)
+
+        # Capture the running loop once; the BLE callback may fire on another
+        # thread and must schedule wakeups onto this loop, not a new one
+        loop = asyncio.get_running_loop()
+        audio_queue = AudioFrameQueue(maxlen=512, loop=loop)
+        decode_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="opus-decode")
+        handle_ble_data = make_ble_handler(decoder, audio_queue, decode_pool, ui.update_status)
+
         try:
             ui.update_status("🔵 Connecting to Omi device...")
             
@@ -130,10 +132,9 @@ def main():
             transcribe_task = asyncio.create_task(transcribe(audio_queue, api_key, on_transcript, ui.update_status))
             demo_task = asyncio.create_task(demo_transcript_injection())
             
-            # Monitor if UI window is closed
+            # Stop everything once the UI window is closed
             async def monitor_ui():
-                while ui.is_running():
-                    await asyncio.sleep(0.5)
+                await ui.wait_closed()
                 print("🖥️ UI window closed, stopping...")
                 omi_task.cancel()
                 transcribe_task.cancel()
@@ -160,9 +161,15 @@ def main():
             # Cleanup resources
             print("🧹 Cleaning up...")
             ui.update_status("🧹 Cleaning up...")
+            decode_pool.shutdown(wait=False)
+            results = await asyncio.gather(*pending_memory_tasks, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    print(f"Memory processing error: {result!r}")
             await cleanup_memory_storage()
 
-    asyncio.run(run())
+    # uvloop when available, otherwise the standard asyncio loop
+    event_loop.run(run())
 
 if __name__ == '__main__':
     main()
@@ -7,47 +7,34 @@ This version will show you transcripts while we work on the Opus decoder
 import asyncio
 import os
 import sys
-import ctypes
-from transcript_ui import TranscriptWindow
-from memory import init_memory_storage, process_transcript_for_memory, cleanup_memory_storage
-from env_config import setup_environment
-from omi.bluetooth import listen_to_omi
-from omi.transcribe import transcribe
-from omi.decoder import OmiOpusDecoder
+from concurrent.futures import ThreadPoolExecutor
+from env_config import load_runtime_config
 
 # Configuration
 OMI_CHAR_UUID = "19B10001-E8F2-537E-4F6C-D104768A1214"
 
-# Force-load libopus from local directory if available
-dll_path = os.path.join(os.path.dirname(__file__), "libopus-0.dll")
-if os.path.exists(dll_path):
-    ctypes.cdll.LoadLibrary(dll_path)
-    print("✅ Loaded libopus-0.dll for optimal audio decoding")
-else:
-    print(f"⚠️  libopus-0.dll not found at: {dll_path}")
-    print("🔄 Will use fallback decoder (limited functionality)")
-
 def main():
-    # Setup environment variables
-    print("🔧 Setting up environment...")
-    if not setup_environment():
-        print("❌ Environment setup failed. Check your configuration.")
-        return
-    
-    # Get OMI_MAC after environment is loaded
-    OMI_MAC = os.getenv("OMI_MAC")
-    if not OMI_MAC:
-        print("❌ OMI_MAC is required but not set in .env file.")
-        print("💡 Please add OMI_MAC=your_device_mac_address to your .env file")
+    # Setup environment variables and validate the device/Deepgram settings
+    runtime_config = load_runtime_config()
+    if runtime_config is None:
         return
+    OMI_MAC, api_key = runtime_config
 
-    api_key = os.getenv("DEEPGRAM_API_KEY")
-    if not api_key:
-        print("❌ DEEPGRAM_API_KEY is required but not set.")
-        print("💡 Create a .env file based on .env.example")
-        return
+    # Heavy imports (Bluetooth, Tk, libopus/opuslib, httpx) are deferred until
+    # the configuration checks above have passed
+    from omi.bluetooth import listen_to_omi
+    from omi.transcribe import transcribe
+    # Map libopus once for the whole process before the decoder (and opuslib) need it
+    from omi import _opus_loader as opus_loader
+    from omi.decoder import OmiOpusDecoder
+    from omi.audio_queue import AudioFrameQueue
+    from omi.ble_audio import make_ble_handler
+    from omi import event_loop
+    from memory import init_memory_storage, process_transcript_for_memory, cleanup_memory_storage
+    from transcript_ui import TranscriptWindow
 
-    print(f"🎧 Using Omi device: {OMI_MAC}")
+    if opus_loader.HANDLE is None:
+        print("🔄 Opus library not found - will use fallback decoder (limited functionality)")
 
     # Initialize components
     print("🖥️ Starting transcript UI window...")
@@ -69,26 +56,8 @@ def main():
         ui.update_status("⚠️  Using local memory storage...")
 
     # Audio processing components
-    audio_queue = asyncio.Queue()
     decoder = OmiOpusDecoder()
 
-    def handle_ble_data(sender, data):
-        decoded_pcm = decoder.decode_packet(data)
-        if decoded_pcm:
-            try:
-                audio_queue.put_nowait(decoded_pcm)
-                # Only show audio activity occasionally to avoid spam
-                if hasattr(handle_ble_data, 'counter'):
-                    handle_ble_data.counter += 1
-                else:
-                    handle_ble_data.counter = 1
-                
-                if handle_ble_data.counter % 50 == 0:  # Show every 50th packet
-                    non_zero_bytes = sum(1 for b in decoded_pcm if b != 0)
-                    print(f"🎤 Audio flowing: packet #{handle_ble_data.counter}, {non_zero_bytes} non-zero bytes")
-            except Exception as e:
-                print("Queue Error:", e)
-
     async def on_transcript(transcript):
         print("🎯 Caught transcript in handler:", transcript)
         
@@ -123,6 +92,13 @@ def main():
             await on_transcript(f"[TEST] {phrase}")
     
     async def run():
+        # Bounded handoff: if transcription stalls the oldest frames are
+        # dropped instead of growing memory without limit
+        loop = asyncio.get_running_loop()
+        audio_queue = AudioFrameQueue(maxlen=512, loop=loop)
+        decode_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="opus-decode")
+        handle_ble_data = make_ble_handler(decoder, audio_queue, decode_pool, ui.update_status, log_every=50, report_levels=True)
+
         try:
             ui.update_status("🔵 Connecting to Omi device...")
             
@@ -133,10 +109,9 @@ def main():
             # Add test transcript injection
             test_task = asyncio.create_task(inject_test_transcripts())
             
-            # Monitor if UI window is closed
+            # Stop everything once the UI window is closed
             async def monitor_ui():
-                while ui.is_running():
-                    await asyncio.sleep(0.5)
+                await ui.wait_closed()
                 print("🖥️ UI window closed, stopping...")
                 omi_task.cancel()
                 transcribe_task.cancel()
@@ -163,10 +138,12 @@ def main():
             # Cleanup resources
             print("🧹 Cleaning up...")
             ui.update_status("🧹 Cleaning up...")
+            decode_pool.shutdown(wait=False)
             await cleanup_memory_storage()
 
     # Run the main loop
-    asyncio.run(run())
+    # uvloop when available, otherwise the standard asyncio loop
+    event_loop.run(run())
 
 if __name__ == "__main__":
     main()
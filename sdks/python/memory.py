@@ -4,16 +4,30 @@ Handles creating memories via MCP API and local storage
 """
 
 import os
-import httpx
+import re
+import sys
+import json
+import time
+import hashlib
+import functools
 import asyncio
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+# Slotted dataclasses need Python 3.10+; older interpreters keep a __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class MemoryConfig:
-    """Configuration for memory storage"""
+    """Configuration for memory storage (read-only once created)"""
     omi_api_key: str
     user_id: str = "default_user"
     mcp_base_url: str = "https://api.omi.com/mcp"  # Replace with actual MCP endpoint
@@ -26,13 +40,12 @@ class MemoryStorage:
     
     def __init__(self, config: MemoryConfig):
         self.config = config
-        self.client = httpx.AsyncClient(
-            timeout=30.0,
-            headers={
-                "Authorization": f"Bearer {config.omi_api_key}",
-                "Content-Type": "application/json"
-            }
-        )
+        self._create_url = f"{config.mcp_base_url}/create_omi_conversation"
+        self._auth_headers = {"Authorization": f"Bearer {config.omi_api_key}"}
+        # Append-mode handle for the local memory log, opened on first use
+        self._memory_log = None
+        # Process-wide client, so every storage instance shares warm connections
+        self.client = _get_http_client()
     
     async def create_memory(self, transcript: str, category: str = "conversation", 
                            metadata: Optional[Dict[str, Any]] = None) -> bool:
@@ -47,7 +60,7 @@ class MemoryStorage:
         Returns:
             bool: True if memory was created successfully
         """
-        timestamp = datetime.now().isoformat()
+        timestamp = _now_iso()
         
         # Prepare memory data
         memory_data = {
@@ -75,15 +88,13 @@ class MemoryStorage:
     async def _create_via_mcp(self, memory_data: Dict[str, Any]) -> bool:
         """Create memory via MCP API"""
         try:
-            # Using the MCP memories endpoint structure
-            mcp_payload = {
-                "text": memory_data["text"],
-                "user_id": memory_data["user_id"],
-                "text_source": memory_data["text_source"],
-                "text_source_spec": f"omi_sdk_{memory_data['category']}",
-                "started_at": memory_data["created_at"],
-                "finished_at": memory_data["created_at"]
-            }
+            # Using the MCP memories endpoint structure; the constant fields
+            # come from a cached template so only the per-memory ones are set here
+            mcp_payload = _payload_template(
+                memory_data["user_id"], memory_data["text_source"], memory_data["category"]
+            ).copy()
+            mcp_payload["text"] = memory_data["text"]
+            mcp_payload["started_at"] = mcp_payload["finished_at"] = memory_data["created_at"]
             
             # Add geolocation if available in metadata
             if "location" in memory_data.get("metadata", {}):
@@ -95,8 +106,7 @@ class MemoryStorage:
                     }
             
             response = await self.client.post(
-                f"{self.config.mcp_base_url}/create_omi_conversation",
-                json=mcp_payload
+                self._create_url, content=_dump_json(mcp_payload), headers=self._auth_headers
             )
             
             if response.status_code == 200:
@@ -123,8 +133,12 @@ class MemoryStorage:
                 f"--- End Entry ---\n"
             )
             
-            with open(self.config.memory_file, "a", encoding="utf-8") as f:
-                f.write(memory_entry)
+            # Append off the event loop so a slow disk never stalls
+            # transcription or BLE draining; the file stays open between
+            # entries instead of paying open/close for each one
+            memory_log = await self._get_memory_log()
+            await memory_log.write(memory_entry)
+            await memory_log.flush()
             
             print(f"💾 Memory stored locally in {self.config.memory_file}")
             return True
@@ -133,9 +147,92 @@ class MemoryStorage:
             print(f"❌ Local storage error: {e}")
             return False
     
+    async def _get_memory_log(self):
+        """Open the local memory log once and keep it for later appends"""
+        if self._memory_log is None:
+            import aiofiles
+            memory_log = await aiofiles.open(self.config.memory_file, "a", encoding="utf-8")
+            if self._memory_log is None:
+                self._memory_log = memory_log
+            else:
+                # Another writer opened it while we were waiting
+                await memory_log.close()
+        return self._memory_log
+    
     async def close(self):
-        """Clean up resources"""
-        await self.client.aclose()
+        """Clean up resources (the shared HTTP client stays open)"""
+        if self._memory_log is not None:
+            await self._memory_log.close()
+            self._memory_log = None
+
+
+# Shared HTTP client for all MemoryStorage instances, created on first use
+_http_client = None
+
+
+def _get_http_client():
+    """Return the process-wide httpx.AsyncClient, creating it if needed"""
+    global _http_client
+    if _http_client is None:
+        # Imported here so `import memory` (hot-phrase helpers, demos) stays cheap
+        import httpx
+        try:
+            import h2  # noqa: F401  (enables httpx HTTP/2 support)
+            http2 = True
+        except ImportError:
+            http2 = False
+        
+        # Long-lived client: keep TLS connections warm between memory posts
+        # and multiplex them over HTTP/2 when the h2 package is installed
+        _http_client = httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=8,
+                max_connections=16,
+                keepalive_expiry=300.0
+            ),
+            headers={"Content-Type": "application/json"}
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared HTTP client; the next MemoryStorage opens a new one"""
+    global _http_client
+    if _http_client is not None:
+        client, _http_client = _http_client, None
+        await client.aclose()
+
+
+@functools.lru_cache(maxsize=32)
+def _payload_template(user_id: str, text_source: str, category: str) -> Dict[str, Any]:
+    """Constant part of an MCP conversation payload; callers must copy it"""
+    return {
+        "user_id": user_id,
+        "text_source": text_source,
+        "text_source_spec": f"omi_sdk_{category}",
+    }
+
+
+def _dump_json(payload: Dict[str, Any]) -> bytes:
+    """Serialize a request body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+# (second, isoformat string) of the last timestamp handed out
+_iso_timestamp_cache = (0, "")
+
+
+def _now_iso() -> str:
+    """Local time as an ISO 8601 string, formatted at most once per second"""
+    global _iso_timestamp_cache
+    now = int(time.time())
+    if now != _iso_timestamp_cache[0]:
+        _iso_timestamp_cache = (now, datetime.fromtimestamp(now).isoformat())
+    return _iso_timestamp_cache[1]
 
 
 # Global memory storage instance
@@ -184,6 +281,8 @@ async def cleanup_memory_storage():
     if _memory_storage:
         await _memory_storage.close()
         _memory_storage = None
+    # The client's connections belong to the current event loop
+    await close_http_client()
 
 
 # Hot phrase patterns and their corresponding categories
@@ -197,6 +296,14 @@ HOT_PHRASES = {
     "save this": "note"
 }
 
+# All hot phrases in one case-insensitive pattern, one capture group per phrase
+# in HOT_PHRASES order, so a single scan finds every phrase present
+_HOT_PHRASE_RE = re.compile(
+    "|".join(f"({re.escape(phrase)})" for phrase in HOT_PHRASES),
+    re.IGNORECASE
+)
+_HOT_PHRASE_CATEGORIES = list(HOT_PHRASES.values())
+
 
 def detect_hot_phrase(transcript: str) -> Optional[str]:
     """
@@ -208,13 +315,65 @@ def detect_hot_phrase(transcript: str) -> Optional[str]:
     Returns:
         Optional[str]: Category if hot phrase detected, None otherwise
     """
-    transcript_lower = transcript.lower()
+    # Earlier HOT_PHRASES entries win, wherever they occur in the transcript
+    best = None
+    for match in _HOT_PHRASE_RE.finditer(transcript):
+        index = match.lastindex - 1
+        if best is None or index < best:
+            best = index
+            if best == 0:
+                break
+    
+    return _HOT_PHRASE_CATEGORIES[best] if best is not None else None
+
+
+class RecentTranscriptCache:
+    """Remembers recent transcripts so repeats can skip memory creation"""
+    
+    def __init__(self, capacity: int = 256, window_seconds: float = 60.0):
+        self.capacity = capacity
+        self.window_seconds = window_seconds
+        self._seen: "OrderedDict[bytes, float]" = OrderedDict()
     
-    for phrase, category in HOT_PHRASES.items():
-        if phrase in transcript_lower:
-            return category
+    @staticmethod
+    def _key(transcript: str) -> bytes:
+        return hashlib.blake2b(transcript.encode("utf-8"), digest_size=16).digest()
     
-    return None
+    def seen_recently(self, transcript: str) -> bool:
+        """
+        Report whether a transcript was recorded within the window
+        
+        Args:
+            transcript: The transcript text
+            
+        Returns:
+            bool: True if add() was called for the same transcript within the window
+        """
+        last_seen = self._seen.get(self._key(transcript))
+        return last_seen is not None and time.monotonic() - last_seen < self.window_seconds
+    
+    def add(self, transcript: str) -> None:
+        """Record a transcript, evicting the oldest entry past capacity"""
+        key = self._key(transcript)
+        self._seen[key] = time.monotonic()
+        self._seen.move_to_end(key)
+        if len(self._seen) > self.capacity:
+            self._seen.popitem(last=False)
+    
+    def discard(self, transcript: str) -> None:
+        """Forget a transcript so it is no longer treated as a repeat"""
+        self._seen.pop(self._key(transcript), None)
+
+
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+# Transcripts that recently produced a memory, keyed on their normalized text
+_recent_memories = RecentTranscriptCache(capacity=256, window_seconds=60.0)
+
+
+def _normalize_transcript(transcript: str) -> str:
+    """Lowercase and collapse punctuation/whitespace so near-repeats compare equal"""
+    return _NON_WORD_RE.sub(" ", transcript.lower()).strip()
 
 
 async def process_transcript_for_memory(transcript: str, metadata: Optional[Dict[str, Any]] = None) -> tuple[bool, Optional[str]]:
@@ -231,8 +390,22 @@ async def process_transcript_for_memory(transcript: str, metadata: Optional[Dict
     category = detect_hot_phrase(transcript)
     
     if category:
-        print(f"🔥 Hot phrase detected! Category: {category}")
-        success = await create_memory(transcript, category, metadata)
+        # Interim and final results often repeat the same words; only post once
+        key = _normalize_transcript(transcript)
+        if _recent_memories.seen_recently(key):
+            print(f"⏭️  Skipping duplicate memory ({category})")
+            return False, None
+        
+        # Reserve the key before awaiting so a concurrent copy of the same
+        # phrase is skipped; release it if the post fails so retries go through
+        _recent_memories.add(key)
+        success = False
+        try:
+            print(f"🔥 Hot phrase detected! Category: {category}")
+            success = await create_memory(transcript, category, metadata)
+        finally:
+            if not success:
+                _recent_memories.discard(key)
         return success, category
     
     return False, None
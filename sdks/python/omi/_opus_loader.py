@@ -0,0 +1,146 @@
+"""
+Process-wide libopus loader
+
+The library is mapped once (RTLD_GLOBAL, so opuslib resolves the same
+symbols) and the handle is shared by every decoder in the process.
+"""
+
+import array
+import ctypes
+import ctypes.util
+import os
+import sys
+from ctypes import c_int, c_void_p, c_char_p, c_short, POINTER
+
+OPUS_LIBRARY_NAMES = ["opus.dll", "libopus-0.dll", "libopus.so.0", "libopus.dylib"]
+
+_SDK_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Remembers where libopus was found last time so later runs try it first
+_PATH_CACHE = os.path.join(os.path.expanduser("~"), ".omi", "opus_library_path.txt")
+
+_LIB = None
+LIBRARY_PATH = None
+
+
+def _cached_path():
+    """Return the library path recorded by a previous run, if still present"""
+    try:
+        with open(_PATH_CACHE, encoding="utf-8") as f:
+            path = f.read().strip()
+    except OSError:
+        return None
+    return path if path and os.path.isfile(path) else None
+
+
+def _remember_path(path):
+    """Record a successfully loaded library path (best effort)"""
+    if not os.path.isabs(path) or path == _cached_path():
+        return
+    try:
+        os.makedirs(os.path.dirname(_PATH_CACHE), exist_ok=True)
+        with open(_PATH_CACHE, "w", encoding="utf-8") as f:
+            f.write(path)
+    except OSError:
+        pass
+
+
+def _expose_dll_directory(path):
+    """On Windows, let opuslib's own lookup find a DLL we loaded by path"""
+    if os.name != "nt" or not os.path.isabs(path):
+        return
+    directory = os.path.dirname(path)
+    os.add_dll_directory(directory)
+    os.environ["PATH"] = directory + os.pathsep + os.environ.get("PATH", "")
+
+
+def _opus_candidates():
+    """Yield library paths/names to try, most specific first"""
+    cached = _cached_path()
+    if cached:
+        yield cached
+    found = ctypes.util.find_library("opus")
+    if found:
+        yield found
+    search_dirs = [_SDK_DIR, os.path.dirname(_SDK_DIR), os.getcwd()]
+    for name in OPUS_LIBRARY_NAMES:
+        for directory in search_dirs:
+            path = os.path.join(directory, name)
+            if os.path.isfile(path):
+                yield path
+        yield name
+
+
+class OpusDecodeError(RuntimeError):
+    """opus_decode reported an error code"""
+
+
+def decode_into(lib, decoder, data, out, frame_size, decode_fec=False):
+    """Decode one Opus packet into out (a c_short buffer or pointer)
+    
+    Returns the number of samples per channel written; raises
+    OpusDecodeError if libopus rejects the packet.
+    """
+    samples = lib.opus_decode(decoder, data, len(data), out, frame_size, int(decode_fec))
+    if samples < 0:
+        raise OpusDecodeError(f"opus_decode returned {samples}")
+    return samples
+
+
+def pcm_to_bytes(buffer, samples):
+    """Copy samples int16 values from a ctypes buffer (or address) as little-endian PCM"""
+    # The C short array already holds native-endian 16-bit PCM, so copy it
+    # out in one memcpy instead of packing per sample
+    pcm = ctypes.string_at(buffer, samples * 2)
+    if sys.byteorder != "little":
+        swapped = array.array("h", pcm)
+        swapped.byteswap()
+        pcm = swapped.tobytes()
+    return pcm
+
+
+def load_opus():
+    """Load libopus once and declare the function signatures we call"""
+    global _LIB, LIBRARY_PATH
+    if _LIB is not None:
+        return _LIB
+    
+    for candidate in _opus_candidates():
+        try:
+            lib = ctypes.CDLL(candidate, mode=ctypes.RTLD_GLOBAL)
+        except OSError:
+            continue
+        
+        try:
+            # opus_decoder_create(Fs, channels, error)
+            lib.opus_decoder_create.argtypes = [c_int, c_int, POINTER(c_int)]
+            lib.opus_decoder_create.restype = c_void_p
+            
+            # opus_decode(decoder, data, len, pcm, frame_size, decode_fec)
+            lib.opus_decode.argtypes = [c_void_p, c_char_p, c_int, POINTER(c_short), c_int, c_int]
+            lib.opus_decode.restype = c_int
+            
+            # opus_decoder_destroy(decoder)
+            lib.opus_decoder_destroy.argtypes = [c_void_p]
+            lib.opus_decoder_destroy.restype = None
+            
+            # opus_get_version_string()
+            lib.opus_get_version_string.argtypes = []
+            lib.opus_get_version_string.restype = c_char_p
+        except AttributeError as e:
+            print(f"⚠️  {candidate} is not a usable Opus library: {e}")
+            continue
+        
+        version = lib.opus_get_version_string().decode("ascii", "replace")
+        print(f"✅ Loaded Opus library: {candidate} ({version})")
+        _LIB = lib
+        LIBRARY_PATH = candidate
+        _remember_path(candidate)
+        _expose_dll_directory(candidate)
+        break
+    
+    return _LIB
+
+
+# Loaded on first import; None if no Opus library could be found
+HANDLE = load_opus()
@@ -0,0 +1,68 @@
+import asyncio
+from collections import deque
+
+
+class AudioFrameQueue:
+    """Hands decoded PCM frames from the BLE callback to the transcriber.
+
+    Frames go into a bounded deque (append/popleft are atomic under the GIL)
+    and the consumer is woken with a single event per burst rather than one
+    coroutine wakeup per frame. When full, the oldest frames are dropped.
+    Exposes the same put_nowait()/get() pair as asyncio.Queue.
+    """
+
+    def __init__(self, maxlen=512, loop=None):
+        self._frames = deque(maxlen=maxlen)
+        self._ready = asyncio.Event()
+        self._loop = loop
+        self._wakeup_pending = False
+        self.dropped = 0  # Frames discarded because the queue was full
+
+    def put_nowait(self, frame):
+        """Add a frame, dropping the oldest if full; never raises.
+        Safe to call from any thread."""
+        if len(self._frames) == self._frames.maxlen:
+            self.dropped += 1
+        self._frames.append(frame)
+        if self._loop is not None and not self._wakeup_pending:
+            self._wakeup_pending = True
+            self._loop.call_soon_threadsafe(self._wakeup)
+
+    def _wakeup(self):
+        self._wakeup_pending = False
+        self._ready.set()
+
+    async def get(self):
+        """Return the next frame, waiting until one is available"""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        while not self._frames:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._frames.popleft()
+
+    def get_nowait(self):
+        """Return a frame without waiting; raises asyncio.QueueEmpty if none"""
+        try:
+            return self._frames.popleft()
+        except IndexError:
+            raise asyncio.QueueEmpty from None
+
+    async def get_batch(self, max_frames=None, max_bytes=None):
+        """Wait for at least one frame, then return the frames queued so far,
+        stopping before max_frames frames or max_bytes bytes are exceeded"""
+        frames = [await self.get()]
+        size = len(frames[0])
+        while self._frames and (max_frames is None or len(frames) < max_frames):
+            if max_bytes is not None and size + len(self._frames[0]) > max_bytes:
+                break
+            frame = self._frames.popleft()
+            frames.append(frame)
+            size += len(frame)
+        return frames
+
+    def qsize(self):
+        return len(self._frames)
+
+    def empty(self):
+        return not self._frames
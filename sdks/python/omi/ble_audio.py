@@ -0,0 +1,52 @@
+import logging
+
+log = logging.getLogger(__name__)
+
+
+def _log_decode_error(future):
+    """Report a packet the decode worker failed on instead of dropping the error"""
+    if future.cancelled():
+        return
+    exc = future.exception()
+    if exc is not None:
+        log.error("Audio decode error: %s", exc, exc_info=exc)
+
+
+def make_ble_handler(decoder, audio_queue, decode_pool, status_callback=None,
+                     log_every=500, report_levels=False):
+    """Build the BLE notification callback feeding the given audio queue.
+
+    Decoding runs on decode_pool (a single worker, so frames stay in
+    order) so the Bluetooth callback only hands the packet off. Every
+    log_every packets the count is printed (with the non-zero byte count
+    when report_levels is set) and new queue drops go to status_callback.
+    """
+    packet_count = 0
+    reported_drops = 0
+
+    def handle_ble_data(sender, data):
+        decode_pool.submit(decode_and_enqueue, data).add_done_callback(_log_decode_error)
+
+    def decode_and_enqueue(data):
+        nonlocal packet_count, reported_drops
+        decoded_pcm = decoder.decode_packet(data)
+        if not decoded_pcm:
+            return
+        # Never raises: a full queue drops its oldest frame instead
+        audio_queue.put_nowait(decoded_pcm)
+        packet_count += 1
+
+        # Track audio activity without logging every packet
+        if packet_count % log_every == 0:
+            if report_levels:
+                # bytes.count runs in C
+                non_zero_bytes = len(decoded_pcm) - decoded_pcm.count(0)
+                print(f"🎤 Audio flowing: packet #{packet_count}, {non_zero_bytes} non-zero bytes")
+            else:
+                print(f"🎤 Audio: {packet_count} packets processed")
+            if audio_queue.dropped != reported_drops:
+                reported_drops = audio_queue.dropped
+                if status_callback:
+                    status_callback(f"⚠️ Transcription lagging: {reported_drops} audio frames dropped")
+
+    return handle_ble_data
@@ -1,32 +1,14 @@
-import os
 import ctypes
+import random
 import sys
+from array import array
+from itertools import chain
 
-# Try to pre-load libopus-0.dll on Windows
-if os.name == 'nt':  # Windows
-    # Try multiple possible locations for the DLL
-    possible_paths = [
-        os.path.join(os.path.dirname(os.path.dirname(__file__)), "opus.dll"),  # Parent directory - renamed DLL
-        os.path.join(os.path.dirname(os.path.dirname(__file__)), "libopus-0.dll"),  # Parent directory - original
-        os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "opus.dll"),  # SDK root - renamed
-        os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "libopus-0.dll"),  # SDK root - original
-        os.path.join(os.getcwd(), "opus.dll"),  # Current working directory - renamed
-        os.path.join(os.getcwd(), "libopus-0.dll"),  # Current working directory - original
-    ]
-    
-    dll_loaded = False
-    for dll_path in possible_paths:
-        if os.path.exists(dll_path):
-            try:
-                ctypes.cdll.LoadLibrary(os.path.abspath(dll_path))
-                print(f"✅ Pre-loaded Opus DLL from: {dll_path}")
-                dll_loaded = True
-                break
-            except Exception as e:
-                print(f"⚠️  Could not load Opus DLL from {dll_path}: {e}")
-    
-    if not dll_loaded:
-        print("⚠️  Opus DLL not found in expected locations")
+# Pre-load libopus through the shared loader so it is only mapped once
+from omi._opus_loader import HANDLE as _OPUS_HANDLE, decode_into, pcm_to_bytes
+
+if _OPUS_HANDLE is None:
+    print("⚠️  Opus DLL not found in expected locations")
 
 # Try to import opuslib, with fallback handling
 try:
@@ -49,11 +31,15 @@ except Exception as e:
                 self.channels = channels
                 print("⚠️  Using minimal fallback decoder")
             
+            _silence = {}  # Silent frames by byte length; bytes are immutable, so shared
+            
             def decode(self, data, frame_size=None, decode_fec=False):
                 # Return silent PCM data for the expected frame size
-                if frame_size:
-                    return b'\x00' * (frame_size * 2)  # 2 bytes per sample for 16-bit
-                return b'\x00' * 1920  # Default frame size * 2
+                nbytes = frame_size * 2 if frame_size else 1920  # 2 bytes per sample for 16-bit
+                silence = self._silence.get(nbytes)
+                if silence is None:
+                    silence = self._silence[nbytes] = bytes(nbytes)
+                return silence
     except Exception:
         # Final fallback
         class Decoder:
@@ -64,13 +50,48 @@ except Exception as e:
             def decode(self, data, frame_size=None, decode_fec=False):
                 return b''
 
+class _LibopusDecoder:
+    """opuslib-compatible decoder calling the shared libopus handle directly
+
+    Used when libopus loads but opuslib is not installed, so the native
+    decoder still handles real audio.
+    """
+    MAX_FRAME_SIZE = 5760  # 120 ms @ 48 kHz, the largest frame Opus produces
+
+    def __init__(self, sample_rate, channels):
+        error = ctypes.c_int()
+        self._decoder = _OPUS_HANDLE.opus_decoder_create(sample_rate, channels, ctypes.byref(error))
+        if error.value != 0 or not self._decoder:
+            raise RuntimeError(f"opus_decoder_create failed: {error.value}")
+        self._pcm_buffer = (ctypes.c_short * (self.MAX_FRAME_SIZE * channels))()
+
+    def decode(self, data, frame_size, decode_fec=False):
+        samples = decode_into(_OPUS_HANDLE, self._decoder, data, self._pcm_buffer, frame_size, decode_fec)
+        return pcm_to_bytes(self._pcm_buffer, samples)
+
+    def __del__(self):
+        if getattr(self, '_decoder', None):
+            _OPUS_HANDLE.opus_decoder_destroy(self._decoder)
+
+
 class OmiOpusDecoder:
+    FALLBACK_FRAME_SAMPLES = 320  # 20ms at 16kHz
+    # Speech-like periodic amplitude envelope applied to fallback frames;
+    # it only depends on the sample index, so it is computed once
+    FALLBACK_ENVELOPE = tuple(abs(((i * 17) % 100) - 50) / 50.0 for i in range(FALLBACK_FRAME_SAMPLES))
+    QUIET_NOISE_LEVELS = range(-25, 26)
+
     def __init__(self):
         try:
             if OPUSLIB_AVAILABLE:
                 self.decoder = Decoder(16000, 1)  # 16kHz mono
                 self.functional = True
                 print("✅ Opus decoder initialized successfully with opuslib")
+            elif _OPUS_HANDLE is not None:
+                # No opuslib, but libopus itself loaded: decode natively
+                self.decoder = _LibopusDecoder(16000, 1)
+                self.functional = True
+                print("✅ Opus decoder initialized successfully with libopus")
             else:
                 self.decoder = Decoder(16000, 1)  # Fallback decoder
                 self.functional = False
@@ -81,17 +102,29 @@ class OmiOpusDecoder:
             self.decoder = Decoder(16000, 1)
             self.functional = False
 
+    @staticmethod
+    def _pcm_bytes(samples):
+        """Return int16 samples as little-endian PCM bytes"""
+        if sys.byteorder != 'little':
+            samples.byteswap()
+        return samples.tobytes()
+
     def decode_packet(self, data):
+        """Decode one Omi BLE packet to 16-bit little-endian PCM bytes
+
+        Returns b'' if the packet is too short or cannot be decoded.
+        """
         if len(data) <= 3:
             return b''
 
-        # Remove 3-byte header
-        clean_data = bytes(data[3:])
+        # Remove 3-byte header (a view, not a copy of the payload)
+        clean_data = memoryview(data)[3:]
 
         # Decode Opus to PCM 16-bit
         try:
             if self.functional:
-                pcm = self.decoder.decode(clean_data, 960, decode_fec=False)
+                # opuslib hands the payload to ctypes, which needs real bytes
+                pcm = self.decoder.decode(clean_data.tobytes(), 960, decode_fec=False)
                 return pcm
             else:
                 # Enhanced fallback: Create more realistic PCM from Opus data
@@ -100,44 +133,24 @@ class OmiOpusDecoder:
                     # But we're generating 960 samples (1920 bytes) which is 60ms - this timing mismatch
                     # might be part of why Deepgram can't recognize it as speech
                     
-                    frame_samples = 320  # 20ms at 16kHz = 320 samples
-                    raw_audio = bytearray(frame_samples * 2)  # 2 bytes per sample
+                    frame_samples = self.FALLBACK_FRAME_SAMPLES  # 20ms at 16kHz = 320 samples
                     
                     if len(clean_data) >= 4:
-                        # Create more speech-like patterns from opus data
-                        for i in range(frame_samples):
-                            data_idx = i % len(clean_data)
-                            
-                            # Use multiple bytes to create more complex patterns
-                            byte1 = clean_data[data_idx]
-                            byte2 = clean_data[(data_idx + 1) % len(clean_data)]
-                            
-                            # Create a more speech-like amplitude pattern
-                            # Combine bytes and apply envelope that mimics speech characteristics
-                            base_val = ((byte1 + byte2) / 2 - 128) * 100
-                            
-                            # Add some speech-like modulation
-                            envelope = abs(((i * 17) % 100) - 50) / 50.0  # Periodic envelope
-                            val = int(base_val * envelope)
-                            
-                            # Clamp to 16-bit range
-                            val = max(-32768, min(32767, val))
-                            
-                            # Store as little-endian 16-bit
-                            raw_audio[i*2] = val & 0xFF
-                            raw_audio[i*2+1] = (val >> 8) & 0xFF
-                        
-                        return bytes(raw_audio)
+                        # Create more speech-like patterns from opus data:
+                        # average each byte with its successor (wrapping),
+                        # repeat that pattern across the frame and apply
+                        # the envelope. Values stay within +/-12800, so no
+                        # clamping to 16-bit is needed.
+                        levels = [((byte1 + byte2) / 2 - 128) * 100
+                                  for byte1, byte2 in zip(clean_data, chain(clean_data[1:], clean_data[:1]))]
+                        levels *= -(-frame_samples // len(levels))
+                        samples = array('h', [int(level * envelope)
+                                              for level, envelope in zip(levels, self.FALLBACK_ENVELOPE)])
+                        return self._pcm_bytes(samples)
                     
                 # If no useful data, return proper-sized quiet noise
-                quiet_noise = bytearray(frame_samples * 2)
-                import random
-                for i in range(0, len(quiet_noise), 2):
-                    # Very quiet random noise with proper frame size
-                    val = random.randint(-25, 25)
-                    quiet_noise[i] = val & 0xFF
-                    quiet_noise[i+1] = (val >> 8) & 0xFF
-                return bytes(quiet_noise)
+                samples = array('h', random.choices(self.QUIET_NOISE_LEVELS, k=self.FALLBACK_FRAME_SAMPLES))
+                return self._pcm_bytes(samples)
         except Exception as e:
             print("Opus decode error:", e)
             return b''
@@ -0,0 +1,22 @@
+import asyncio
+import sys
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def run(main):
+    """Run a coroutine like asyncio.run(), on uvloop when it is installed.
+
+    uvloop speeds up the socket-heavy Deepgram/MCP paths; it has no Windows
+    support, so the stdlib loop is always used there.
+    """
+    if uvloop is None or sys.platform == "win32":
+        return asyncio.run(main)
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(main)
+    uvloop.install()
+    return asyncio.run(main)
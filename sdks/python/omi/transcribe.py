@@ -1,33 +1,93 @@
 import websockets
 import json
 import asyncio
+import logging
+import random
+
+try:
+    import orjson
+    # Parses str or bytes frames directly in C
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+log = logging.getLogger(__name__)
+
+# Audio coalesced into one WebSocket message; 3200 bytes is 100ms of
+# 16kHz mono linear16, which keeps interim transcripts responsive whatever
+# frame size the decoder produces
+MAX_BYTES_PER_SEND = 3200
+
+# Reconnect delay doubles per failed attempt, from 1s up to 60s, plus up to
+# 25% random jitter so many clients do not retry in lockstep
+RETRY_INITIAL_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+
+# Progress is logged each time this many more audio bytes have been sent
+SEND_MILESTONE_BYTES = 100000
+
+async def next_audio_batch(audio_queue, max_bytes=MAX_BYTES_PER_SEND):
+    """Wait for audio, then take up to max_bytes of what is queued in one go"""
+    if hasattr(audio_queue, "get_batch"):
+        return await audio_queue.get_batch(max_bytes=max_bytes)
+    chunks = [await audio_queue.get()]
+    size = len(chunks[0])
+    while size < max_bytes and not audio_queue.empty():
+        chunk = audio_queue.get_nowait()
+        chunks.append(chunk)
+        size += len(chunk)
+    return chunks
+
+DEEPGRAM_URL = "wss://api.deepgram.com/v1/listen?punctuate=true&model=nova&language=en-US&encoding=linear16&sample_rate=16000&channels=1"
 
 async def transcribe(audio_queue, api_key, on_transcript=None, status_callback=None):
-    url = "wss://api.deepgram.com/v1/listen?punctuate=true&model=nova&language=en-US&encoding=linear16&sample_rate=16000&channels=1"
     headers = {
         "Authorization": f"Token {api_key}"
     }
+    retry_delay = RETRY_INITIAL_DELAY
     
     while True:
         try:
             if status_callback:
                 status_callback("🔄 Connecting to Deepgram...")
-            async with websockets.connect(url, additional_headers=headers) as ws:
+            # Raw linear16 audio does not compress, so skip permessage-deflate
+            # rather than spend CPU deflating every frame we send
+            async with websockets.connect(DEEPGRAM_URL, additional_headers=headers, compression=None) as ws:
                 print("Connected to Deepgram WebSocket")
+                retry_delay = RETRY_INITIAL_DELAY
                 if status_callback:
                     status_callback("🎤 Connected to Deepgram - Ready to transcribe!")
 
                 async def send_audio():
                     audio_bytes_sent = 0
+                    next_milestone = SEND_MILESTONE_BYTES
+                    # Reused for every batch; client frames are masked into a
+                    # new buffer by websockets, so it is free again once
+                    # send() returns
+                    send_view = memoryview(bytearray(MAX_BYTES_PER_SEND))
                     while True:
                         try:
-                            chunk = await audio_queue.get()
+                            # One wakeup and one WebSocket frame per burst of
+                            # BLE frames rather than one of each per frame
+                            chunks = await next_audio_batch(audio_queue)
+                            size = sum(map(len, chunks))
+                            if len(chunks) == 1:
+                                chunk = chunks[0]
+                            elif size <= len(send_view):
+                                offset = 0
+                                for frame in chunks:
+                                    send_view[offset:offset + len(frame)] = frame
+                                    offset += len(frame)
+                                chunk = send_view[:size]
+                            else:
+                                chunk = b"".join(chunks)
                             await ws.send(chunk)
                             audio_bytes_sent += len(chunk)
                             
                             # Minimal logging - only show major milestones
-                            if audio_bytes_sent % 100000 == 0:  # Every ~100KB
-                                print(f"🎵 {audio_bytes_sent//1000}KB sent to Deepgram")
+                            if audio_bytes_sent >= next_milestone:  # Every ~100KB
+                                log.debug("🎵 %dKB sent to Deepgram", audio_bytes_sent // 1000)
+                                next_milestone += SEND_MILESTONE_BYTES
                         except Exception as e:
                             print(f"Error sending audio: {e}")
                             break
@@ -35,26 +95,39 @@ async def transcribe(audio_queue, api_key, on_transcript=None, status_callback=N
                 async def receive_transcripts():
                     try:
                         async for msg in ws:
+                            # Metadata/keepalive frames carry neither key;
+                            # skip them without a full JSON parse
+                            if isinstance(msg, str):
+                                if '"transcript"' not in msg and '"error"' not in msg:
+                                    continue
+                            elif b'"transcript"' not in msg and b'"error"' not in msg:
+                                continue
                             try:
-                                response = json.loads(msg)
+                                response = _loads(msg)
                                 if "error" in response:
                                     print(f"Deepgram Error: {response['error']}")
                                     continue
                                     
                                 # Extract transcript from the response
-                                if "channel" in response and "alternatives" in response["channel"]:
-                                    transcript = response["channel"]["alternatives"][0].get("transcript", "")
-                                    if transcript and transcript.strip():
-                                        transcript = transcript.strip()
-                                        print("\nTranscript:", transcript)
-
-                                        if on_transcript:
-                                            try:
-                                                await on_transcript(transcript)
-                                            except Exception as e:
-                                                print(f"on_transcript error: {e}")
+                                try:
+                                    transcript = response["channel"]["alternatives"][0]["transcript"]
+                                except (KeyError, IndexError, TypeError):
+                                    continue
+                                transcript = transcript.strip() if transcript else ""
+                                if not transcript:
+                                    continue
+                                
+                                if on_transcript:
+                                    # The handler reports it; only trace here
+                                    log.debug("Transcript: %s", transcript)
+                                    try:
+                                        await on_transcript(transcript)
+                                    except Exception as e:
+                                        print(f"on_transcript error: {e}")
+                                else:
+                                    print("\nTranscript:", transcript)
 
-                            except json.JSONDecodeError as e:
+                            except ValueError as e:  # json/orjson JSONDecodeError
                                 print(f"Error decoding response: {e}")
                             except Exception as e:
                                 print(f"Error processing transcript: {e}")
@@ -72,5 +145,7 @@ async def transcribe(audio_queue, api_key, on_transcript=None, status_callback=N
             print(f"Connection error: {e}")
             if status_callback:
                 status_callback(f"⚠️ Deepgram connection lost, retrying...")
-            print("Retrying connection in 5 seconds...")
-            await asyncio.sleep(5)
+            delay = retry_delay + random.uniform(0, retry_delay * 0.25)
+            retry_delay = min(retry_delay * 2, RETRY_MAX_DELAY)
+            print(f"Retrying connection in {delay:.1f} seconds...")
+            await asyncio.sleep(delay)
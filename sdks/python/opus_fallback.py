@@ -6,16 +6,27 @@ import base64
 class FallbackOpusDecoder:
     '''Fallback decoder that provides basic functionality when libopus-0.dll is not available'''
     
+    DEFAULT_FRAME_SIZE = 320  # 20ms at 16kHz
+    
     def __init__(self, sample_rate, channels):
         self.sample_rate = sample_rate
         self.channels = channels
+        self._silence = {}  # Silent frames by frame size; bytes are immutable, so shared
+        self._warned = False
         warnings.warn("Using fallback Opus decoder. Audio quality may be reduced.", UserWarning)
     
     def decode(self, opus_data, frame_size=None):
         # This is a placeholder - in a real implementation you would need
-        # to use a different audio decoding library or download the DLL manually
-        warnings.warn("Fallback decoder cannot actually decode Opus data", UserWarning)
-        return b''  # Return empty bytes as placeholder
+        # to use a different audio decoding library or download the DLL manually.
+        # Return correctly sized silence so the audio stream keeps its timing
+        if not self._warned:
+            warnings.warn("Fallback decoder cannot actually decode Opus data", UserWarning)
+            self._warned = True
+        frame_size = frame_size or self.DEFAULT_FRAME_SIZE
+        silence = self._silence.get(frame_size)
+        if silence is None:
+            silence = self._silence[frame_size] = bytes(frame_size * 2 * self.channels)
+        return silence
 
 # Monkey patch opuslib if it fails to load
 try:
@@ -51,8 +51,7 @@ async def quick_ui_test():
     ui.update_status("✅ Test completed - UI is working!")
     
     # Keep running until user closes window
-    while ui.is_running():
-        await asyncio.sleep(1)
+    await ui.wait_closed()
     
     print("✅ UI test completed!")
 
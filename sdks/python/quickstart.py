@@ -7,21 +7,33 @@ One-command setup and launch
 import subprocess
 import sys
 import os
+from collections import deque
 from pathlib import Path
+from env_config import read_env_bytes
+
+# Lines of a failed command's stderr repeated in the warning summary
+STDERR_TAIL_LINES = 5
 
 
 def run_command(cmd, description):
     """Run a command and handle errors gracefully"""
     print(f"🔄 {description}...")
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-        if result.returncode == 0:
+        # stdout streams straight to the terminal; stderr is echoed as it
+        # arrives and only its tail is kept for the warning summary
+        with subprocess.Popen(cmd, shell=True, stderr=subprocess.PIPE, text=True) as proc:
+            stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+            for line in proc.stderr:
+                sys.stderr.write(line)
+                stderr_tail.append(line)
+        
+        if proc.returncode == 0:
             print(f"✅ {description} completed")
             return True
         else:
             print(f"⚠️  {description} completed with warnings")
-            if result.stderr:
-                print(f"   {result.stderr.strip()}")
+            if stderr_tail:
+                print(f"   {''.join(stderr_tail).strip()}")
             return True  # Continue anyway
     except Exception as e:
         print(f"❌ {description} failed: {e}")
@@ -53,12 +65,9 @@ def main():
     run_command(f"{sys.executable} test.py", "System tests")
     
     # Step 4: Check configuration
-    env_file = Path(".env")
-    if env_file.exists():
-        with open(env_file, 'r') as f:
-            content = f.read()
-            
-        if "your_deepgram_api_key_here" in content:
+    content = read_env_bytes()
+    if content is not None:
+        if b"your_deepgram_api_key_here" in content:
             print("\n⚠️  ACTION REQUIRED:")
             print("1. Edit .env file with your real Deepgram API key")
             print("2. Optionally add OMI_API_KEY for MCP storage")
@@ -8,6 +8,7 @@ import os
 import sys
 import shutil
 from pathlib import Path
+from env_config import read_env_bytes
 
 
 def check_python_version():
@@ -108,26 +109,19 @@ def check_bluetooth():
 
 def validate_config():
     """Validate the current configuration"""
-    env_file = Path(".env")
+    try:
+        content = read_env_bytes()
+    except Exception as e:
+        print(f"❌ Error reading .env: {e}")
+        return False
     
-    if not env_file.exists():
+    if content is None:
         print("⚠️  No .env file found")
         return False
     
     # Basic validation
-    has_deepgram = False
-    has_omi = False
-    
-    try:
-        with open(env_file, 'r') as f:
-            content = f.read()
-            if 'DEEPGRAM_API_KEY=' in content and 'your_deepgram_api_key_here' not in content:
-                has_deepgram = True
-            if 'OMI_API_KEY=' in content and 'your_omi_api_key_here' not in content:
-                has_omi = True
-    except Exception as e:
-        print(f"❌ Error reading .env: {e}")
-        return False
+    has_deepgram = b'DEEPGRAM_API_KEY=' in content and b'your_deepgram_api_key_here' not in content
+    has_omi = b'OMI_API_KEY=' in content and b'your_omi_api_key_here' not in content
     
     if has_deepgram:
         print("✅ Deepgram API key configured")
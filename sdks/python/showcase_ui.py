@@ -60,8 +60,7 @@ def main():
     
     # Wait for the UI to close
     try:
-        while ui.is_running():
-            time.sleep(0.5)
+        ui.wait_until_closed()
     except KeyboardInterrupt:
         print("\n🛑 Interrupted by user")
     
@@ -5,8 +5,10 @@ Tests core functionality without requiring actual hardware
 """
 
 import asyncio
+import importlib
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, AsyncMock
 from memory import init_memory_storage, process_transcript_for_memory, cleanup_memory_storage
 from env_config import setup_environment
@@ -106,57 +108,52 @@ def test_environment():
         print("ℹ️  Omi API key not configured (will use local storage)")
 
 
+# (module, attribute or None, label) for the imports test_imports() checks
+REQUIRED_IMPORTS = [
+    ("asyncio", None, "asyncio"),
+    ("bleak", None, "bleak (Bluetooth)"),
+    ("websockets", None, "websockets"),
+    ("httpx", None, "httpx"),
+    ("omi.bluetooth", "listen_to_omi", "omi.bluetooth"),
+    ("omi.transcribe", "transcribe", "omi.transcribe"),
+]
+
+
+def _try_import(module_name, attribute=None):
+    """Import a module (and optionally look up a name); return the error or None"""
+    try:
+        module = importlib.import_module(module_name)
+        if attribute:
+            getattr(module, attribute)
+        return None
+    except Exception as e:
+        return e
+
+
 def test_imports():
     """Test all required imports"""
     print("🧪 Testing module imports...")
     
-    try:
-        import asyncio
-        print("✅ asyncio")
-    except ImportError:
-        print("❌ asyncio")
-        return False
-    
-    try:
-        import bleak
-        print("✅ bleak (Bluetooth)")
-    except ImportError:
-        print("❌ bleak (Bluetooth)")
-        return False
-    
-    try:
-        import websockets
-        print("✅ websockets")
-    except ImportError:
-        print("❌ websockets")
-        return False
-    
-    try:
-        import httpx
-        print("✅ httpx")
-    except ImportError:
-        print("❌ httpx")
-        return False
-    
-    try:
-        from omi.bluetooth import listen_to_omi
-        print("✅ omi.bluetooth")
-    except ImportError:
-        print("❌ omi.bluetooth")
-        return False
-    
-    try:
-        from omi.transcribe import transcribe
-        print("✅ omi.transcribe")
-    except ImportError:
-        print("❌ omi.transcribe")
-        return False
+    # Cold imports (bleak in particular) are slow; probe them concurrently
+    # and report in the usual order
+    with ThreadPoolExecutor(max_workers=len(REQUIRED_IMPORTS)) as pool:
+        errors = list(pool.map(lambda spec: _try_import(spec[0], spec[1]), REQUIRED_IMPORTS))
+    
+    for (_, _, label), error in zip(REQUIRED_IMPORTS, errors):
+        if error is None:
+            print(f"✅ {label}")
+        elif isinstance(error, ImportError):
+            print(f"❌ {label}")
+            return False
+        else:
+            raise error
     
-    try:
-        from omi.decoder import OmiOpusDecoder
+    # The decoder prints its own diagnostics, so import it on its own
+    error = _try_import("omi.decoder", "OmiOpusDecoder")
+    if error is None:
         print("✅ omi.decoder")
-    except Exception as e:
-        print(f"⚠️  omi.decoder: {e}")
+    else:
+        print(f"⚠️  omi.decoder: {error}")
         print("   (This is expected if libopus-0.dll is not properly installed)")
         print("   💡 Run install_opus_dll.py to fix this")
         # This is non-critical for basic testing
@@ -213,4 +210,5 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    from omi import event_loop
+    event_loop.run(main())
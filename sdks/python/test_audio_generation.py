@@ -3,10 +3,13 @@
 Test script to validate the audio generation from our fallback decoder
 """
 
+import logging
 import os
 import wave
 from omi.decoder import OmiOpusDecoder
 
+log = logging.getLogger(__name__)
+
 def test_audio_generation():
     """Test the fallback decoder and save some audio samples"""
     print("🧪 Testing fallback audio decoder...")
@@ -24,21 +27,28 @@ def test_audio_generation():
     print(f"Decoder functional: {decoder.functional}")
     print(f"Using fallback: {not decoder.functional}")
     
-    # Decode the packets and collect audio
-    all_audio = bytearray()
+    # Decode the packets and collect the frames; they are joined once at
+    # the end instead of copied into a growing buffer
+    frames = []
     
+    # Per-packet details are debug logs so they stay out of timing runs
+    verbose = log.isEnabledFor(logging.DEBUG)
     for i, packet in enumerate(test_packets):
-        print(f"\n📦 Processing packet {i+1}:")
-        print(f"   Input size: {len(packet)} bytes")
-        
         decoded = decoder.decode_packet(packet)
         if decoded:
-            print(f"   Decoded size: {len(decoded)} bytes")
-            non_zero = sum(1 for b in decoded if b != 0)
-            print(f"   Non-zero bytes: {non_zero}/{len(decoded)} ({100*non_zero/len(decoded):.1f}%)")
-            all_audio.extend(decoded)
+            frames.append(decoded)
+            if verbose:
+                non_zero = len(decoded) - decoded.count(0)
+                log.debug("📦 Packet %d: %d -> %d bytes, non-zero %d (%.1f%%)",
+                          i + 1, len(packet), len(decoded), non_zero, 100 * non_zero / len(decoded))
         else:
-            print("   No audio decoded")
+            log.debug("📦 Packet %d: %d bytes, no audio decoded", i + 1, len(packet))
+    
+    all_audio = b"".join(frames)
+    print(f"\n📦 Decoded {len(frames)}/{len(test_packets)} packets into {len(all_audio)} bytes")
+    if all_audio:
+        non_zero = len(all_audio) - all_audio.count(0)
+        print(f"   Non-zero bytes: {non_zero}/{len(all_audio)} ({100*non_zero/len(all_audio):.1f}%)")
     
     # Save the generated audio to a WAV file for inspection
     if all_audio:
@@ -50,7 +60,7 @@ def test_audio_generation():
                 wav_file.setnchannels(1)  # Mono
                 wav_file.setsampwidth(2)  # 16-bit
                 wav_file.setframerate(16000)  # 16kHz
-                wav_file.writeframes(bytes(all_audio))
+                wav_file.writeframes(all_audio)
             
             print(f"✅ Audio saved! File size: {len(all_audio)} bytes")
             print(f"   Duration: {len(all_audio) / (16000 * 2):.2f} seconds")
@@ -69,4 +79,5 @@ def test_audio_generation():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     test_audio_generation()
@@ -7,12 +7,17 @@ import ctypes
 import os
 from ctypes import c_int, c_void_p, c_char_p, c_short, POINTER, byref
 
+from omi._opus_loader import OpusDecodeError, decode_into, pcm_to_bytes
+
 class DirectOpusDecoder:
     """Direct Opus decoder using ctypes instead of opuslib"""
     
+    MAX_FRAME_SIZE = 5760  # 120 ms @ 48 kHz, the largest frame Opus produces
+    
     def __init__(self):
         self.decoder = None
         self.functional = False
+        self._pcm_buffer = None
         
         # Try to load the Opus library directly
         dll_paths = [
@@ -55,6 +60,8 @@ class DirectOpusDecoder:
             
             if error.value == 0 and self.decoder:
                 self.functional = True
+                # Output buffer reused by every decode() call
+                self._pcm_buffer = (c_short * self.MAX_FRAME_SIZE)()
                 print("✅ Direct Opus decoder created successfully!")
             else:
                 print(f"❌ Failed to create Opus decoder, error: {error.value}")
@@ -68,35 +75,51 @@ class DirectOpusDecoder:
             return None
             
         try:
-            # Create output buffer
-            pcm_buffer = (c_short * frame_size)()
+            # Reuse the preallocated output buffer, growing it only if a
+            # caller asks for more samples than it can hold
+            if frame_size > len(self._pcm_buffer):
+                self._pcm_buffer = (c_short * frame_size)()
+            pcm_buffer = self._pcm_buffer
             
             # Decode
-            samples = self.lib.opus_decode(
-                self.decoder,
-                opus_data,
-                len(opus_data),
-                pcm_buffer,
-                frame_size,
-                0  # decode_fec
-            )
-            
+            samples = decode_into(self.lib, self.decoder, opus_data, pcm_buffer, frame_size)
             if samples > 0:
-                # Convert to bytes
-                result = bytearray()
-                for i in range(samples):
-                    sample = pcm_buffer[i]
-                    result.append(sample & 0xFF)
-                    result.append((sample >> 8) & 0xFF)
-                return bytes(result)
-            else:
-                print(f"Opus decode returned {samples}")
-                return None
+                return pcm_to_bytes(pcm_buffer, samples)
+            print(f"Opus decode returned {samples}")
+            return None
                 
         except Exception as e:
             print(f"Opus decode error: {e}")
             return None
     
+    def decode_many(self, packets, frame_size=960):
+        """Decode a list of Opus packets into one contiguous PCM bytes object
+        
+        Each packet decodes straight into its place in a shared scratch
+        buffer, so the whole batch costs one copy out. ctypes drops the GIL
+        around every opus_decode call, letting a worker thread run this while
+        the main thread keeps servicing BLE. Packets that fail to decode are
+        skipped.
+        """
+        if not self.functional or not self.decoder:
+            return None
+        
+        capacity = len(packets) * frame_size
+        if capacity > len(self._pcm_buffer):
+            self._pcm_buffer = (c_short * capacity)()
+        base = ctypes.addressof(self._pcm_buffer)
+        sample_size = ctypes.sizeof(c_short)
+        
+        offset = 0  # in samples
+        for opus_data in packets:
+            out = ctypes.cast(base + offset * sample_size, POINTER(c_short))
+            try:
+                offset += decode_into(self.lib, self.decoder, opus_data, out, frame_size)
+            except OpusDecodeError as e:
+                print(f"Opus decode error: {e}")
+        
+        return pcm_to_bytes(base, offset)
+    
     def __del__(self):
         """Clean up decoder"""
         if self.functional and self.decoder and self.lib:
@@ -121,7 +144,7 @@ def test_direct_decoder():
         
         if result:
             print(f"✅ Decoded {len(test_data)} bytes to {len(result)} bytes")
-            non_zero = sum(1 for b in result if b != 0)
+            non_zero = len(result) - bytes(result).count(0)
             print(f"   Non-zero bytes: {non_zero}/{len(result)}")
         else:
             print("❌ Decoding failed")
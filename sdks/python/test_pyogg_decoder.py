@@ -44,6 +44,19 @@ class PyOggOpusDecoder:
         except Exception as e:
             print(f"PyOgg decode error: {e}")
             return None
+    
+    def decode_many(self, packets, frame_size=960):
+        """Decode a list of Opus packets into one contiguous PCM bytes object"""
+        if not self.functional:
+            return None
+        
+        pcm = bytearray()
+        for opus_data in packets:
+            try:
+                pcm += self.decoder.decode(opus_data)
+            except Exception as e:
+                print(f"PyOgg decode error: {e}")
+        return bytes(pcm)
 
 
 def test_pyogg_decoder():
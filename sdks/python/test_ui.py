@@ -26,8 +26,7 @@ print("💡 Close the window or press Ctrl+C to exit.")
 
 try:
     # Keep running until window is closed
-    while ui.is_running():
-        time.sleep(1)
+    ui.wait_until_closed()
     print("👋 Window closed.")
 except KeyboardInterrupt:
     print("\n🛑 Test interrupted.")
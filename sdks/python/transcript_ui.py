@@ -3,25 +3,53 @@ Real-time Transcript UI Window for Omi Python SDK
 Displays live transcriptions from the Omi device in a native Tkinter window.
 """
 
+import asyncio
+import sys
 import tkinter as tk
 from tkinter import ttk, scrolledtext
 import threading
-import queue
+import time
+from collections import deque
 from datetime import datetime
 import json
 import os
 
+# (second, "HH:MM:SS") of the last clock timestamp formatted
+_clock_cache = (None, "")
+
+
+def _clock_time():
+    """Local wall-clock time as HH:MM:SS, formatted at most once per second"""
+    global _clock_cache
+    now = int(time.time())
+    if now != _clock_cache[0]:
+        _clock_cache = (now, time.strftime("%H:%M:%S", time.localtime(now)))
+    return _clock_cache[1]
+
+
 class TranscriptWindow:
     """Real-time transcript display window with advanced features."""
     
+    # The Tk thread polls the update queue on a fixed tick, which bounds
+    # how long a transcript waits to be drawn; producers never call into
+    # Tk themselves
+    POLL_INTERVAL_MS = 100
+    
     def __init__(self, title="🎧 Omi Live Transcript"):
         self.root = None
         self.text_widget = None
         self.status_label = None
         self.memory_count = 0
         self.transcript_count = 0
-        self.ui_queue = queue.Queue()
+        self.max_lines = 5000  # Oldest lines are dropped past this
+        # Producers append and the Tk thread pops; both are atomic on a
+        # deque, so no lock is needed. A stalled UI drops the oldest updates.
+        self.ui_queue = deque(maxlen=10000)
         self.running = True
+        self._closed = False
+        self.closed = threading.Event()  # Set once the window has closed
+        self._close_waiters = []  # (loop, asyncio.Event) pairs from wait_closed()
+        self._close_lock = threading.Lock()
         
         # Configuration
         self.config = {
@@ -40,6 +68,13 @@ class TranscriptWindow:
     
     def _create_window(self, title):
         """Create and run the Tkinter window in a separate thread."""
+        try:
+            self._run_window(title)
+        finally:
+            self._notify_closed()
+    
+    def _run_window(self, title):
+        """Build the window and block in the Tk main loop."""
         self.root = tk.Tk()
         self.root.title(title)
         self.root.geometry("800x600")
@@ -65,7 +100,7 @@ class TranscriptWindow:
         self._create_control_buttons(main_frame)
         
         # Start the periodic update checker
-        self.root.after(100, self._check_queue)
+        self.root.after(self.POLL_INTERVAL_MS, self._check_queue)
         
         # Handle window closing
         self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
@@ -188,65 +223,130 @@ class TranscriptWindow:
     
     def _check_queue(self):
         """Check for UI updates from the main thread."""
+        self._drain_queue()
+        
+        # Schedule next check
+        if self.root:
+            self.root.after(self.POLL_INTERVAL_MS, self._check_queue)
+    
+    def _drain_queue(self):
+        """Apply every queued update in one pass."""
+        # Drain everything queued since the last tick and redraw once;
+        # only the latest status matters, so earlier ones are skipped
+        updates = []
+        status = None
         try:
             while True:
-                update_type, data = self.ui_queue.get_nowait()
+                update_type, data = self.ui_queue.popleft()
                 
-                if update_type == 'transcript':
-                    self._add_transcript_text(data)
-                elif update_type == 'memory':
-                    self._add_memory_notification(data)
-                elif update_type == 'status':
-                    self._update_status(data)
+                if update_type == 'status':
+                    status = data
+                elif update_type == 'batch':
+                    for batch_type, batch_data in data:
+                        if batch_type == 'status':
+                            status = batch_data
+                        else:
+                            updates.append((batch_type, batch_data))
+                else:
+                    updates.append((update_type, data))
                     
-        except queue.Empty:
+        except IndexError:
             pass
         
-        # Schedule next check
-        if self.root:
-            self.root.after(100, self._check_queue)
+        if status is not None:
+            self._update_status(status)
+        if len(updates) == 1:
+            update_type, data = updates[0]
+            if update_type == 'transcript':
+                self._add_transcript_text(data)
+            elif update_type == 'memory':
+                self._add_memory_notification(data)
+        elif updates:
+            self._apply_batch(updates)
     
-    def _add_transcript_text(self, transcript_data):
-        """Add transcript text to the display."""
+    def _apply_batch(self, updates):
+        """Apply a burst of updates with a single text widget refresh."""
         if not self.text_widget:
             return
-            
-        timestamp = transcript_data.get('timestamp', datetime.now().strftime("%H:%M:%S"))
-        text = transcript_data.get('text', '')
-        
-        self.text_widget.config(state=tk.NORMAL)
         
-        # Add timestamp
-        self.text_widget.insert(tk.END, f"[{timestamp}] ", 'timestamp')
+        # Collect every line as text/tag pairs and insert them in one Tk call
+        segments = []
+        for update_type, data in updates:
+            if update_type == 'transcript':
+                segments.extend(self._transcript_segments(data))
+            elif update_type == 'memory':
+                segments.extend(self._memory_segments(data))
+            elif update_type == 'status':
+                self._update_status(data)
         
-        # Add transcript text
-        self.text_widget.insert(tk.END, f"{text}\n", 'transcript')
+        self.text_widget.config(state=tk.NORMAL)
+        if segments:
+            self.text_widget.insert(tk.END, *segments)
+            self._trim_lines()
         
         # Auto-scroll to bottom
         self.text_widget.see(tk.END)
         self.text_widget.config(state=tk.DISABLED)
+        self.memory_label.config(text=f"💾 Memories: {self.memory_count}")
+        self.root.update_idletasks()
+    
+    def _transcript_segments(self, transcript_data):
+        """Return the text/tag pairs for a timestamped transcript line."""
+        timestamp = transcript_data.get('timestamp') or _clock_time()
+        text = transcript_data.get('text', '')
         
         self.transcript_count += 1
+        return (f"[{timestamp}] ", 'timestamp', f"{text}\n", 'transcript')
+    
+    def _memory_segments(self, memory_data):
+        """Return the text/tag pair for a memory notification line."""
+        category = memory_data.get('category', 'note')
+        text = memory_data.get('text', '')
+        
+        self.memory_count += 1
+        return (f"    🧠 Memory Created ({category}): {text}\n", 'memory')
+    
+    def _insert_transcript(self, transcript_data):
+        """Insert a timestamped transcript line (text widget must be editable)."""
+        self.text_widget.insert(tk.END, *self._transcript_segments(transcript_data))
+    
+    def _insert_memory(self, memory_data):
+        """Insert a memory notification line (text widget must be editable)."""
+        self.text_widget.insert(tk.END, *self._memory_segments(memory_data))
+    
+    def _trim_lines(self):
+        """Drop the oldest lines so at most max_lines remain (widget must be editable)."""
+        # Every line ends in a newline, so 'end-1c' sits on an empty last line
+        line_count = int(self.text_widget.index('end-1c').split('.')[0]) - 1
+        if line_count > self.max_lines:
+            self.text_widget.delete('1.0', f'{line_count - self.max_lines + 1}.0')
+    
+    def _add_transcript_text(self, transcript_data):
+        """Add transcript text to the display."""
+        if not self.text_widget:
+            return
+        
+        self.text_widget.config(state=tk.NORMAL)
+        self._insert_transcript(transcript_data)
+        self._trim_lines()
+        
+        # Auto-scroll to bottom
+        self.text_widget.see(tk.END)
+        self.text_widget.config(state=tk.DISABLED)
     
     def _add_memory_notification(self, memory_data):
         """Add memory creation notification."""
         if not self.text_widget:
             return
-            
-        category = memory_data.get('category', 'note')
-        text = memory_data.get('text', '')
         
         self.text_widget.config(state=tk.NORMAL)
-        
-        # Add memory notification
-        memory_text = f"    🧠 Memory Created ({category}): {text}\n"
-        self.text_widget.insert(tk.END, memory_text, 'memory')
+        self._insert_memory(memory_data)
+        self._trim_lines()
         
         # Auto-scroll to bottom
         self.text_widget.see(tk.END)
         self.text_widget.config(state=tk.DISABLED)
         
-        self.memory_count += 1
         self.memory_label.config(text=f"💾 Memories: {self.memory_count}")
     
     def _update_status(self, status_text):
@@ -304,25 +404,80 @@ class TranscriptWindow:
             self.root.destroy()
             self.root = None
     
+    def _notify_closed(self):
+        """Wake every coroutine waiting in wait_closed()."""
+        with self._close_lock:
+            self.running = False
+            self._closed = True
+            waiters, self._close_waiters = self._close_waiters, []
+        self.closed.set()
+        
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # Loop already closed
+    
     # Public methods for external use
     def update_transcript(self, transcript_text):
         """Add new transcript text to the window."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.ui_queue.put(('transcript', {
-            'text': transcript_text,
-            'timestamp': timestamp
-        }))
+        self.ui_queue.append(self._transcript_update(transcript_text))
     
     def update_memory(self, category, text):
         """Add memory creation notification."""
-        self.ui_queue.put(('memory', {
-            'category': category,
-            'text': text
-        }))
+        self.ui_queue.append(self._memory_update(category, text))
     
     def update_status(self, status_text):
         """Update the status display."""
-        self.ui_queue.put(('status', status_text))
+        self.ui_queue.append(('status', status_text))
+    
+    def apply_updates(self, updates):
+        """Apply several updates in one UI pass.
+        
+        Each update is ('transcript', text), ('memory', category, text)
+        or ('status', text).
+        """
+        batch = []
+        for update_type, *args in updates:
+            if update_type == 'transcript':
+                batch.append(self._transcript_update(*args))
+            elif update_type == 'memory':
+                batch.append(self._memory_update(*args))
+            elif update_type == 'status':
+                batch.append(('status', args[0]))
+        
+        if batch:
+            self.ui_queue.append(('batch', batch))
+    
+    @staticmethod
+    def _transcript_update(transcript_text):
+        return ('transcript', {
+            'text': transcript_text,
+            'timestamp': _clock_time()
+        })
+    
+    @staticmethod
+    def _memory_update(category, text):
+        return ('memory', {
+            'category': category,
+            'text': text
+        })
+    
+    async def wait_closed(self):
+        """Wait until the UI window has been closed, without polling."""
+        event = asyncio.Event()
+        with self._close_lock:
+            if self._closed:
+                return
+            self._close_waiters.append((asyncio.get_running_loop(), event))
+        await event.wait()
+    
+    def wait_until_closed(self):
+        """Block the calling thread until the UI window has been closed."""
+        # Windows does not deliver Ctrl+C during an untimed lock wait
+        timeout = 1.0 if sys.platform == "win32" else None
+        while not self.closed.wait(timeout):
+            pass
     
     def is_running(self):
         """Check if the UI window is still running."""